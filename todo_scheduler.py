@@ -1,25 +1,102 @@
+import array
+import bisect
+import hashlib
 import json
 import os
+import sys
 from datetime import datetime, time
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library codec
+    orjson = None
+
+# Priorities and completion are stored as small ints and index these tuples
+_PRIORITY_NAMES = ("high", "medium", "low")
+_PRIORITY_LEVEL = {name: level for level, name in enumerate(_PRIORITY_NAMES)}
+_VALID_PRIORITIES = frozenset(_PRIORITY_NAMES)
+_DEFAULT_PRIORITY = _PRIORITY_LEVEL["medium"]
+_PRIORITY_SYMBOL = ("❗", "•", "◦")
+_STATUS = (" ", "✓")
+
+
+def _parse_time(time_str):
+    """Convert an H:MM or HH:MM string to minutes since midnight"""
+    hours, _, minutes = time_str.partition(":")
+    if not (1 <= len(hours) <= 2 and len(minutes) == 2
+            and (hours + minutes).isascii() and (hours + minutes).isdigit()):
+        raise ValueError(f"Invalid time: {time_str}")
+    hours, minutes = int(hours), int(minutes)
+    if hours >= 24 or minutes >= 60:
+        raise ValueError(f"Time out of range: {time_str}")
+    return hours * 60 + minutes
+
+
+def _dumps(data, pretty=False):
+    """Serialize data to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _loads(payload):
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _format_time(minute_of_day):
+    """Convert minutes since midnight back to an HH:MM string"""
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
 class TodoWithScheduler:
-    def __init__(self):
-        self.tasks = []
+    def __init__(self, debug=False):
+        self.debug = debug  # Pretty-print the saved JSON
+        self._clear_tasks()
+        self._next_id = 1
         self.schedule = {}
+        self._sorted_slots = []  # Keys of self.schedule in time order
+        self._pending_by_slot = {}  # Like self.schedule, minus completed tasks
+        self._slot_of = {}
         self.filename = "todo_schedule.json"
+        self._dirty = False
+        self._last_saved_digest = None  # SHA-256 of the bytes last read or written
         self.load_data()
 
+    def _clear_tasks(self):
+        """Reset the task columns (one parallel sequence per field)"""
+        # Numeric fields are packed C arrays; only the strings stay as lists
+        self.task_ids = array.array("l")
+        self.task_names = []
+        self.task_priorities = array.array("b")  # Index into _PRIORITY_NAMES
+        self.task_completed = array.array("b")  # 0 or 1
+        self.task_created = []
+        self._row_of = {}  # Task ID -> position in the columns
+
+    def _append_task(self, task_id, task, priority, completed, created_at):
+        """Append one task to the end of every column"""
+        self._row_of[task_id] = len(self.task_ids)
+        self.task_ids.append(task_id)
+        self.task_names.append(task)
+        self.task_priorities.append(priority)
+        self.task_completed.append(completed)
+        self.task_created.append(created_at)
+
     def add_task(self, task, priority="medium", scheduled_time=None):
         """Add a new task to the to-do list"""
-        task_id = len(self.tasks) + 1
-        new_task = {
-            "id": task_id,
-            "task": task,
-            "priority": priority,
-            "completed": False,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
-        self.tasks.append(new_task)
+        # Normalize unknown priorities once so rendering never has to
+        if priority not in _VALID_PRIORITIES:
+            priority = "medium"
+
+        task_id = self._next_id
+        self._next_id += 1
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self._append_task(task_id, task, _PRIORITY_LEVEL[priority], 0, created_at)
+        self._dirty = True
         
         # If a time is scheduled, add to schedule
         if scheduled_time:
@@ -30,53 +107,67 @@ class TodoWithScheduler:
 
     def remove_task(self, task_id):
         """Remove a task by ID"""
-        for i, task in enumerate(self.tasks):
-            if task["id"] == task_id:
-                removed_task = self.tasks.pop(i)
-                print(f"Task '{removed_task['task']}' removed.")
-                
-                # Remove from schedule if it exists
-                for time_slot in list(self.schedule.keys()):
-                    if task_id in self.schedule[time_slot]:
-                        self.schedule[time_slot].remove(task_id)
-                        if not self.schedule[time_slot]:  # If empty list
-                            del self.schedule[time_slot]
-                return True
-        print(f"Task with ID {task_id} not found.")
-        return False
+        row = self._row_of.pop(task_id, None)
+        if row is None:
+            print(f"Task with ID {task_id} not found.")
+            return False
+
+        removed_name = self.task_names[row]
+        for column in (self.task_ids, self.task_names, self.task_priorities,
+                       self.task_completed, self.task_created):
+            del column[row]
+        # Later tasks shifted up by one
+        for later_id in self.task_ids[row:]:
+            self._row_of[later_id] -= 1
+
+        self._dirty = True
+        print(f"Task '{removed_name}' removed.")
+        
+        # Remove from schedule if it exists
+        self._remove_from_schedule(task_id)
+        return True
 
     def mark_complete(self, task_id):
         """Mark a task as completed"""
-        for task in self.tasks:
-            if task["id"] == task_id:
-                task["completed"] = True
-                print(f"Task '{task['task']}' marked as completed.")
-                return True
-        print(f"Task with ID {task_id} not found.")
-        return False
+        row = self._row_of.get(task_id)
+        if row is None:
+            print(f"Task with ID {task_id} not found.")
+            return False
+
+        if not self.task_completed[row]:
+            self.task_completed[row] = 1
+            self._drop_pending(task_id)
+        self._dirty = True
+        print(f"Task '{self.task_names[row]}' marked as completed.")
+        return True
+
+    def _task_name(self, task_id):
+        """Look up a task's description, or an empty string if unknown"""
+        row = self._row_of.get(task_id)
+        return self.task_names[row] if row is not None else ""
 
     def schedule_task(self, task_id, time_str):
         """Schedule a task for a specific time"""
         try:
             # Parse time string (format: HH:MM)
-            task_time = datetime.strptime(time_str, "%H:%M").time().strftime("%H:%M")
+            task_time = _parse_time(time_str)
             
-            # Create schedule entry if it doesn't exist
-            if task_time not in self.schedule:
-                self.schedule[task_time] = []
-                
-            # Add task to schedule if not already there
-            if task_id not in self.schedule[task_time]:
+            # A task occupies a single slot, so move it if already scheduled
+            if self._slot_of.get(task_id) != task_time:
+                self._remove_from_schedule(task_id)
+
+                # Create schedule entry if it doesn't exist
+                if task_time not in self.schedule:
+                    bisect.insort(self._sorted_slots, task_time)
+                    self.schedule[task_time] = []
                 self.schedule[task_time].append(task_id)
+                self._slot_of[task_id] = task_time
+                row = self._row_of.get(task_id)
+                if row is None or not self.task_completed[row]:
+                    self._pending_by_slot.setdefault(task_time, []).append(task_id)
+                self._dirty = True
                 
-            # Find task name for confirmation message
-            task_name = ""
-            for task in self.tasks:
-                if task["id"] == task_id:
-                    task_name = task["task"]
-                    break
-                    
-            print(f"Task '{task_name}' scheduled for {time_str}")
+            print(f"Task '{self._task_name(task_id)}' scheduled for {time_str}")
             return True
         except ValueError:
             print("Invalid time format. Please use HH:MM format (e.g., 14:30)")
@@ -84,106 +175,219 @@ class TodoWithScheduler:
 
     def unschedule_task(self, task_id):
         """Remove a task from the schedule"""
-        task_found = False
-        for time_slot in list(self.schedule.keys()):
-            if task_id in self.schedule[time_slot]:
-                self.schedule[time_slot].remove(task_id)
-                if not self.schedule[time_slot]:  # If empty list
-                    del self.schedule[time_slot]
-                task_found = True
-        
-        if task_found:
-            # Find task name for confirmation message
-            task_name = ""
-            for task in self.tasks:
-                if task["id"] == task_id:
-                    task_name = task["task"]
-                    break
-            print(f"Task '{task_name}' removed from schedule.")
+        if self._remove_from_schedule(task_id):
+            print(f"Task '{self._task_name(task_id)}' removed from schedule.")
             return True
         else:
             print(f"Task with ID {task_id} not found in schedule.")
             return False
 
+    def _drop_pending(self, task_id):
+        """Take a task out of the pending index if it is scheduled there"""
+        time_slot = self._slot_of.get(task_id)
+        pending = self._pending_by_slot.get(time_slot)
+        if pending and task_id in pending:
+            pending.remove(task_id)
+            if not pending:
+                del self._pending_by_slot[time_slot]
+
+    def _remove_from_schedule(self, task_id):
+        """Drop a task from its time slot, returning whether it was scheduled"""
+        self._drop_pending(task_id)
+        time_slot = self._slot_of.pop(task_id, None)
+        if time_slot is None:
+            return False
+
+        self.schedule[time_slot].remove(task_id)
+        if not self.schedule[time_slot]:  # If empty list
+            del self.schedule[time_slot]
+            self._sorted_slots.pop(bisect.bisect_left(self._sorted_slots, time_slot))
+        self._dirty = True
+        return True
+
     def view_tasks(self):
         """Display all tasks"""
-        if not self.tasks:
+        if not self.task_ids:
             print("No tasks found.")
             return
             
-        print("\n===== TO-DO LIST =====")
-        for task in self.tasks:
-            status = "✓" if task["completed"] else " "
-            priority_symbol = {"high": "❗", "medium": "•", "low": "◦"}.get(task["priority"], "•")
-            
+        lines = ["\n===== TO-DO LIST ====="]
+        for task_id, task, priority, completed in zip(
+            self.task_ids, self.task_names, self.task_priorities, self.task_completed
+        ):
             # Find scheduled time if any
-            scheduled_time = ""
-            for time_slot, task_ids in self.schedule.items():
-                if task["id"] in task_ids:
-                    scheduled_time = f" @ {time_slot}"
-                    break
+            time_slot = self._slot_of.get(task_id)
+            scheduled_time = f" @ {_format_time(time_slot)}" if time_slot is not None else ""
                     
-            print(f"[{status}] {task['id']}. {priority_symbol} {task['task']}{scheduled_time}")
-        print("=====================\n")
+            lines.append(f"[{_STATUS[completed]}] {task_id}. {_PRIORITY_SYMBOL[priority]} {task}{scheduled_time}")
+        lines.append("=====================\n")
+        # Emit the whole list in one write
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def view_schedule(self):
-        """Display the day's schedule"""
-        if not self.schedule:
+    def view_schedule(self, show_completed=False):
+        """Display the day's schedule, hiding completed tasks unless asked"""
+        by_slot = self.schedule if show_completed else self._pending_by_slot
+        if not by_slot:
             print("No scheduled tasks for today.")
             return
             
-        print("\n===== TODAY'S SCHEDULE =====")
-        # Sort time slots
-        sorted_times = sorted(self.schedule.keys(), key=lambda x: datetime.strptime(x, "%H:%M").time())
-        
-        for time_slot in sorted_times:
-            print(f"\n{time_slot}:")
-            for task_id in self.schedule[time_slot]:
-                for task in self.tasks:
-                    if task["id"] == task_id:
-                        status = "✓" if task["completed"] else " "
-                        priority_symbol = {"high": "❗", "medium": "•", "low": "◦"}.get(task["priority"], "•")
-                        print(f"  [{status}] {task_id}. {priority_symbol} {task['task']}")
-                        break
-        print("===========================\n")
-
-    def save_data(self):
-        """Save tasks and schedule to a file"""
+        lines = ["\n===== TODAY'S SCHEDULE ====="]
+        for time_slot in self._sorted_slots:
+            task_ids = by_slot.get(time_slot)
+            if not task_ids:
+                continue
+            lines.append(f"\n{_format_time(time_slot)}:")
+            for task_id in task_ids:
+                row = self._row_of.get(task_id)
+                if row is None:
+                    continue
+                status = _STATUS[self.task_completed[row]]
+                priority_symbol = _PRIORITY_SYMBOL[self.task_priorities[row]]
+                lines.append(f"  [{status}] {task_id}. {priority_symbol} {self.task_names[row]}")
+        lines.append("===========================\n")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def save_data(self, sync=False):
+        """Save tasks and schedule to a file, fsyncing it first if sync is set"""
+        if not self._dirty:
+            print("No changes to save.")
+            return
+
+        # The file keeps one object per task
+        tasks = {
+            str(task_id): {
+                "id": task_id,
+                "task": task,
+                "priority": _PRIORITY_NAMES[priority],
+                "completed": bool(completed),
+                "created_at": created_at
+            }
+            for task_id, task, priority, completed, created_at in zip(
+                self.task_ids, self.task_names, self.task_priorities,
+                self.task_completed, self.task_created
+            )
+        }
         data = {
-            "tasks": self.tasks,
-            "schedule": self.schedule
+            "tasks": tasks,
+            "schedule": {_format_time(t): task_ids for t, task_ids in self.schedule.items()},
+            "next_id": self._next_id
         }
-        with open(self.filename, "w") as f:
-            json.dump(data, f, indent=2)
+        payload = _dumps(data, pretty=self.debug)
+
+        # Skip the write if the content matches what is already on disk
+        payload_digest = hashlib.sha256(payload).digest()
+        if payload_digest != self._last_saved_digest:
+            # Write a sibling file and swap it in so a crash never leaves a partial file
+            # (a buffered write either writes the whole payload or raises)
+            tmp_filename = self.filename + ".tmp"
+            try:
+                with open(tmp_filename, "wb") as f:
+                    f.write(payload)
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_filename, self.filename)
+            except OSError:
+                # Leave the previous data file untouched and no stray .tmp behind
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
+                raise
+            self._last_saved_digest = payload_digest
+        self._dirty = False
         print(f"Data saved to {self.filename}")
 
     def load_data(self):
         """Load tasks and schedule from a file"""
         if os.path.exists(self.filename):
             try:
-                with open(self.filename, "r") as f:
-                    data = json.load(f)
-                    self.tasks = data.get("tasks", [])
-                    self.schedule = data.get("schedule", {})
+                with open(self.filename, "rb") as f:
+                    raw = f.read()
+                    data = _loads(raw)
+                    tasks = data.get("tasks", {})
+                    schedule = data.get("schedule", {})
+                # Older files store tasks as a list
+                if isinstance(tasks, dict):
+                    tasks = list(tasks.values())
+                # Never hand out an id at or below one already in use
+                self._next_id = max(data.get("next_id", 1),
+                                    max((task["id"] for task in tasks), default=0) + 1)
+                self._clear_tasks()
+                for task in tasks:
+                    task_id = task["id"]
+                    # Older files could repeat an id after a removal. The first copy keeps
+                    # the id, and with it every schedule entry for that id; later copies
+                    # get fresh, unscheduled ids. The schedule is normalized below, after
+                    # this renumbering, so a repeated id scheduled twice ends up in one slot.
+                    if task_id in self._row_of:
+                        task_id = self._next_id
+                        self._next_id += 1
+                        self._dirty = True
+                    # Only id and description are required; older entries may lack the rest
+                    level = _PRIORITY_LEVEL.get(task.get("priority"), _DEFAULT_PRIORITY)
+                    completed = 1 if task.get("completed") else 0
+                    self._append_task(task_id, task["task"], level,
+                                      completed, task.get("created_at", ""))
+                # Time slots are stored as HH:MM on disk
+                loaded_schedule = {_parse_time(t): task_ids for t, task_ids in schedule.items()}
+                # Older files could list a task in several slots, or twice in one;
+                # keep only its earliest slot so every task has exactly one
+                self.schedule = {}
+                self._slot_of = {}
+                for time_slot in sorted(loaded_schedule):
+                    task_ids = loaded_schedule[time_slot]
+                    kept = []
+                    for task_id in task_ids:
+                        if task_id not in self._slot_of:
+                            self._slot_of[task_id] = time_slot
+                            kept.append(task_id)
+                    if kept:
+                        self.schedule[time_slot] = kept
+                    if len(kept) != len(task_ids) or not kept:
+                        self._dirty = True
+                self._sorted_slots = sorted(self.schedule)
+                self._pending_by_slot = {}
+                for time_slot, task_ids in self.schedule.items():
+                    pending = [
+                        task_id for task_id in task_ids
+                        if task_id not in self._row_of
+                        or not self.task_completed[self._row_of[task_id]]
+                    ]
+                    if pending:
+                        self._pending_by_slot[time_slot] = pending
+                # Saving unchanged data can then skip rewriting the file
+                self._last_saved_digest = hashlib.sha256(raw).digest()
                 print(f"Data loaded from {self.filename}")
-            except (json.JSONDecodeError, FileNotFoundError):
+            except (json.JSONDecodeError, FileNotFoundError, ValueError,
+                    KeyError, TypeError, AttributeError):
                 print(f"Error loading data from {self.filename}")
-                self.tasks = []
+                self._clear_tasks()
+                self._next_id = 1
                 self.schedule = {}
+                self._sorted_slots = []
+                self._pending_by_slot = {}
+                self._slot_of = {}
+                # Drop anything flagged mid-parse so the unreadable file isn't overwritten
+                self._dirty = False
+                self._last_saved_digest = None
+
+
+_MENU = (
+    "\n===== TO-DO LIST MENU =====\n"
+    "1. Add a task\n"
+    "2. Remove a task\n"
+    "3. Mark a task as completed\n"
+    "4. Schedule a task\n"
+    "5. Remove a task from schedule\n"
+    "6. View all tasks\n"
+    "7. View today's schedule\n"
+    "8. Save and exit\n"
+    "==========================\n"
+)
 
 
 def show_menu():
     """Display the menu options"""
-    print("\n===== TO-DO LIST MENU =====")
-    print("1. Add a task")
-    print("2. Remove a task")
-    print("3. Mark a task as completed")
-    print("4. Schedule a task")
-    print("5. Remove a task from schedule")
-    print("6. View all tasks")
-    print("7. View today's schedule")
-    print("8. Save and exit")
-    print("==========================")
+    sys.stdout.write(_MENU)
     return input("Choose an option (1-8): ")
 
 
@@ -198,7 +402,7 @@ def main():
         if choice == "1":  # Add a task
             task = input("Enter task description: ")
             priority = input("Enter priority (high/medium/low) [default: medium]: ").lower()
-            if priority not in ["high", "medium", "low"]:
+            if priority not in _VALID_PRIORITIES:
                 priority = "medium"
                 
             schedule_now = input("Do you want to schedule this task? (y/n): ").lower()
@@ -235,7 +439,7 @@ def main():
                 print("Please enter a valid task ID (number).")
                 
         elif choice == "5":  # Remove from schedule
-            todo.view_schedule()
+            todo.view_schedule(show_completed=True)
             try:
                 task_id = int(input("Enter task ID to remove from schedule: "))
                 todo.unschedule_task(task_id)
@@ -251,7 +455,7 @@ def main():
             input("Press Enter to continue...")
                        
         elif choice == "8":  # Save and exit
-            todo.save_data()
+            todo.save_data(sync=True)
             print("Thank you for using the To-Do List with Day Scheduler. Goodbye!")
             break
             